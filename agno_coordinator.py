@@ -1,4 +1,5 @@
 from typing import List, Optional
+import asyncio
 import os
 import time
 import threading
@@ -97,10 +98,11 @@ move_decision_team = Team(
         "  - Do NOT proceed to Step 2 until you have this information",
         "",
         "Step 2 - Delegate to Sub-Agents (ONLY after Step 1 is complete):",
-        "Once you have confirmed you have all necessary information, proceed with delegation:",
-        "  - First, delegate to the Cost Analyst to analyze the cost of living differences",
-        "  - Then, delegate to the Sentiment Analyst to research the city's vibe and livability",
-        "  - Then, delegate to the Migration Researcher to find experiences from similar moves",
+        "Once you have confirmed you have all necessary information, delegate the analysis to all members at once.",
+        "They work in parallel, each on their own part:",
+        "  - The Cost Analyst analyzes the cost of living differences",
+        "  - The Sentiment Analyst researches the city's vibe and livability",
+        "  - The Migration Researcher finds experiences from similar moves",
         "",
         "Step 3 - Synthesize Results:",
         "After receiving all three analyses, synthesize the information into a clear recommendation.",
@@ -109,6 +111,8 @@ move_decision_team = Team(
         "Ensure you populate the 'featured_migration_quotes' field in the final output using the data from the Migration Researcher.",
     ],
     output_schema=FinalRecommendation,
+    # The three specialists are independent, so run them concurrently instead of one-by-one
+    delegate_task_to_all_members=True,
     add_member_tools_to_context=False,
     markdown=True,
     show_members_responses=True,
@@ -545,8 +549,8 @@ Please analyze whether this user should move from {user_profile.current_city} to
 Coordinate with all three specialist agents and provide a comprehensive recommendation.
 """
     
-    # Run the team analysis
-    response = move_decision_team.run(input=context)
+    # Run the team analysis; the async path runs the member agents concurrently
+    response = asyncio.run(move_decision_team.arun(input=context))
     
     if response.content:
         return response.content
@@ -6,7 +6,7 @@ Provides REST API endpoints to trigger move analysis.
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import PlainTextResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict
 import uvicorn
 import os
@@ -41,27 +41,19 @@ app.add_middleware(
 analysis_results: Dict[str, dict] = {}
 
 
-class AnalysisRequest(BaseModel):
-    """Request model for move analysis"""
-    current_city: str = Field(..., description="The city you currently live in", example="New York City")
-    desired_city: str = Field(..., description="The city you're considering moving to", example="Austin")
-    annual_income: Optional[float] = Field(None, description="Your annual income", example=85000.0)
-    monthly_expenses: Optional[float] = Field(None, description="Your monthly expenses", example=3500.0)
-    city_preferences: list[str] = Field(
-        default_factory=list,
-        description="What you value in a city",
-        example=["good weather", "tech industry", "arts scene"]
-    )
-    current_city_likes: list[str] = Field(
-        default_factory=list,
-        description="What you like about your current city",
-        example=["great public transit", "diverse food options"]
-    )
-    current_city_dislikes: list[str] = Field(
-        default_factory=list,
-        description="What you dislike about your current city",
-        example=["high cost of living", "harsh winters"]
-    )
+class AnalysisRequest(UserProfile):
+    """Request model for move analysis (the UserProfile fields, with API examples)"""
+    model_config = ConfigDict(json_schema_extra={
+        "examples": [{
+            "current_city": "New York City",
+            "desired_city": "Austin",
+            "annual_income": 85000.0,
+            "monthly_expenses": 3500.0,
+            "city_preferences": ["good weather", "tech industry", "arts scene"],
+            "current_city_likes": ["great public transit", "diverse food options"],
+            "current_city_dislikes": ["high cost of living", "harsh winters"],
+        }]
+    })
 
 
 class AnalysisResponse(BaseModel):
@@ -151,15 +143,7 @@ async def analyze_move(
     analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
     
     # Convert request to UserProfile
-    user_profile = UserProfile(
-        current_city=request.current_city,
-        desired_city=request.desired_city,
-        annual_income=request.annual_income,
-        monthly_expenses=request.monthly_expenses,
-        city_preferences=request.city_preferences,
-        current_city_likes=request.current_city_likes,
-        current_city_dislikes=request.current_city_dislikes
-    )
+    user_profile = UserProfile(**request.model_dump())
     
     # Store initial status
     analysis_results[analysis_id] = {
@@ -4,7 +4,9 @@ Uses fuzzy matching to handle variations in city names.
 """
 
 import json
+import math
 import os
+from itertools import chain
 from typing import Optional, Dict, Tuple
 from difflib import get_close_matches
 
@@ -31,6 +33,30 @@ class CityMatcher:
         else:
             print(f"⚠️  City list file not found: {cities_file}")
             print(f"   Run 'python scrape_city_list.py' first to generate the city list.")
+        
+        # Bucket display names by length so fuzzy matching can skip candidates
+        # whose length alone rules out reaching the cutoff
+        self._display_names = [city_data.get('display_name', key) for key, city_data in self.cities.items()]
+        self._by_len_bucket: Dict[int, list] = {}
+        for name in self._display_names:
+            self._by_len_bucket.setdefault(len(name), []).append(name)
+    
+    def _length_band_candidates(self, user_input: str, cutoff: float) -> list:
+        """
+        Get display names whose length allows a similarity ratio >= cutoff.
+        
+        difflib's ratio is 2*M / (len(a) + len(b)) with M <= min(len(a), len(b)),
+        so any candidate outside [L*c/(2-c), L*(2-c)/c] can never reach the cutoff.
+        """
+        length = len(user_input)
+        if cutoff <= 0:
+            return self._display_names
+        # Small slack so float rounding never excludes a name that lands exactly on the cutoff
+        min_len = math.ceil(length * cutoff / (2 - cutoff) - 1e-9)
+        max_len = math.floor(length * (2 - cutoff) / cutoff + 1e-9)
+        return list(chain.from_iterable(
+            self._by_len_bucket.get(n, []) for n in range(min_len, max_len + 1)
+        ))
     
     def find_city(self, user_input: str, cutoff: float = 0.6) -> Optional[Dict]:
         """
@@ -58,9 +84,9 @@ class CityMatcher:
             if city_data.get('display_name', '').lower() == user_input.lower():
                 return city_data
         
-        # Try fuzzy matching on display names
-        display_names = [city_data.get('display_name', key) for key, city_data in self.cities.items()]
-        matches = get_close_matches(user_input, display_names, n=1, cutoff=cutoff)
+        # Try fuzzy matching on display names of a plausible length
+        candidates = self._length_band_candidates(user_input, cutoff)
+        matches = get_close_matches(user_input, candidates, n=1, cutoff=cutoff)
         
         if matches:
             # Find the city data for this match
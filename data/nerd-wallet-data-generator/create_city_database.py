@@ -4,7 +4,15 @@ Since the city list is loaded dynamically via JavaScript, we'll create
 a curated list of major US cities that NerdWallet likely supports.
 """
 
-import json
+import sys
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import orjson
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 
 # Comprehensive list of major US cities organized by state
 # Format: (city_name, state_name, state_abbr)
@@ -267,6 +275,33 @@ US_CITIES = [
     ("Madison", "Wisconsin", "WI"),
 ]
 
+# Intern names so repeated cities/states (Springfield, Texas, ...) share one string object
+US_CITIES = [tuple(map(sys.intern, row)) for row in US_CITIES]
+
+# State abbreviation column of US_CITIES, for the per-state summary
+_STATE_ABBRS = tuple(abbr for _, _, abbr in US_CITIES)
+
+
+def _city_url(city: str) -> str:
+    """
+    URL slug for a city name (e.g. "St. Louis" -> "st-louis", "New York (Brooklyn)" -> "new-york-brooklyn").
+    """
+    # Handle NYC boroughs specially (remove parentheses for URL)
+    if "New York (" in city:
+        # Extract borough name
+        borough = city.split('(')[1].rstrip(')')
+        return f"new-york-{borough.lower().replace(' ', '-')}"
+    
+    # Lowercase, spaces to dashes
+    return city.lower().replace(' ', '-').replace('.', '')
+
+
+# Full NerdWallet URL formats ("st-louis-mo"), computed once so the build loop is a plain lookup
+_URL_FORMATS = {
+    (city, state_abbr): f"{_city_url(city)}-{state_abbr.lower()}"
+    for city, _, state_abbr in US_CITIES
+}
+
 
 # Common city aliases for fuzzy matching
 CITY_ALIASES = {
@@ -283,41 +318,29 @@ CITY_ALIASES = {
     "Philly": ("Philadelphia", "Pennsylvania", "PA"),
     "Vegas": ("Las Vegas", "Nevada", "NV"),
 }
+CITY_ALIASES = {alias: tuple(map(sys.intern, target)) for alias, target in CITY_ALIASES.items()}
 
 
-def create_city_database():
-    """
-    Create a comprehensive city database in NerdWallet format.
+@lru_cache(maxsize=1)
+def _build_cities() -> dict:
     """
-    print("="*80)
-    print("CREATING CITY DATABASE")
-    print("="*80)
+    Build the city database from US_CITIES and CITY_ALIASES.
     
+    The inputs are module constants, so the result is computed once and reused.
+    """
     cities = {}
     
     for city, state, state_abbr in US_CITIES:
         # Create display name
         display_name = f"{city}, {state_abbr}"
         
-        # Create URL format (lowercase, spaces to dashes)
-        city_url = city.lower().replace(' ', '-').replace('.', '')
-        
-        # Handle NYC boroughs specially (remove parentheses for URL)
-        if "New York (" in city:
-            # Extract borough name
-            borough = city.split('(')[1].rstrip(')')
-            city_url = f"new-york-{borough.lower().replace(' ', '-')}"
-        
-        state_url = state_abbr.lower()
-        url_format = f"{city_url}-{state_url}"
-        
         # Add to database
         cities[display_name] = {
             "display_name": display_name,
             "city": city,
             "state": state,
             "state_abbr": state_abbr,
-            "url_format": url_format
+            "url_format": _URL_FORMATS[city, state_abbr]
         }
     
     # Add aliases
@@ -326,30 +349,143 @@ def create_city_database():
         if display_name in cities:
             cities[display_name]["aliases"] = cities[display_name].get("aliases", []) + [alias]
     
+    return cities
+
+
+def _copy_city(data: dict) -> dict:
+    """
+    Copy of a cached city entry, so callers can't mutate the shared database.
+    """
+    data = dict(data)
+    if "aliases" in data:
+        data["aliases"] = list(data["aliases"])
+    return data
+
+
+@lru_cache(maxsize=1)
+def _cities_json_bytes() -> bytes:
+    """Serialized city database, in the same format as the committed JSON file."""
+    return orjson.dumps(_build_cities(), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+
+
+@lru_cache(maxsize=1)
+def _alias_keys() -> tuple:
+    """
+    Normalized display names, bare city names and aliases, paired with the display name each
+    resolves to (a city name shared by several states resolves to the first one listed).
+    """
+    cities = _build_cities()
+    targets = {name: name for name in cities}
+    for name, data in cities.items():
+        targets.setdefault(data["city"], name)
+    for alias, (city, state, state_abbr) in CITY_ALIASES.items():
+        display_name = f"{city}, {state_abbr}"
+        if display_name in cities:
+            targets.setdefault(alias, display_name)
+    
+    return [default_process(key) for key in targets], list(targets.values())
+
+
+def resolve_city(query: str, score_cutoff: float = 85) -> Optional[dict]:
+    """
+    Resolve a city name or alias, tolerating typos (e.g. "Los Angelas", "Philly").
+    
+    Args:
+        query: User's city input
+        score_cutoff: Minimum similarity score (0-100)
+    
+    Returns:
+        Dictionary with city data if found, None otherwise
+    """
+    keys, targets = _alias_keys()
+    
+    # Plain ratio, not WRatio: WRatio's partial matching scores ~90 for any query starting with
+    # a short key, so "Lakewood" resolved to "LA" and "San Mateo" to "SF".
+    # Keys are already normalized, so skip per-candidate preprocessing.
+    match = process.extractOne(
+        default_process(query), keys,
+        scorer=fuzz.ratio, processor=None, score_cutoff=score_cutoff
+    )
+    if match is None:
+        return None
+    
+    return _copy_city(_build_cities()[targets[match[2]]])
+
+
+@lru_cache(maxsize=1)
+def _sorted_url_formats() -> tuple:
+    """
+    (url_format, display_name) pairs sorted by URL format, for prefix lookups.
+    """
+    return tuple(sorted((data["url_format"], name) for name, data in _build_cities().items()))
+
+
+def find_by_url_prefix(prefix: str, limit: int = 10) -> list:
+    """
+    Find cities whose URL format starts with a prefix (e.g. "san f" -> "san-francisco-ca").
+    
+    Args:
+        prefix: Beginning of a city name or URL format
+        limit: Maximum number of results
+    
+    Returns:
+        List of matching city data dictionaries, ordered by URL format
+    """
+    entries = _sorted_url_formats()
+    cities = _build_cities()
+    prefix = prefix.strip().lower().replace(' ', '-')
+    
+    # Binary search to the first candidate, then walk forward while the prefix holds
+    results = []
+    for i in range(bisect_left(entries, (prefix,)), len(entries)):
+        url_format, display_name = entries[i]
+        if not url_format.startswith(prefix) or len(results) >= limit:
+            break
+        results.append(_copy_city(cities[display_name]))
+    
+    return results
+
+
+@lru_cache(maxsize=1)
+def _database_summary() -> tuple:
+    """
+    Top 10 states by city count and the first 20 cities (sorted), for the build report.
+    """
+    # Display names are unique, so counting the state column matches counting the database
+    states = Counter(_STATE_ABBRS)
+    return states.most_common(10), sorted(_build_cities().items())[:20]
+
+
+def create_city_database():
+    """
+    Create a comprehensive city database in NerdWallet format.
+    """
+    print("="*80)
+    print("CREATING CITY DATABASE")
+    print("="*80)
+    
+    cities = _build_cities()
+    
     # Save to JSON
-    with open("../data/nerdwallet_cities_comprehensive.json", "w", encoding="utf-8") as f:
-        json.dump(cities, f, indent=2, sort_keys=True)
+    Path("../data/nerdwallet_cities_comprehensive.json").write_bytes(_cities_json_bytes())
     
     print(f"\n✅ Created database with {len(cities)} cities")
     print(f"✅ Saved to: data/nerdwallet_cities_comprehensive.json")
     
     # Show statistics
-    states = {}
-    for city_data in cities.values():
-        state = city_data['state_abbr']
-        states[state] = states.get(state, 0) + 1
+    top_states, sample = _database_summary()
     
     print(f"\n📊 Cities by state (top 10):")
-    for state, count in sorted(states.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for state, count in top_states:
         print(f"   {state}: {count} cities")
     
     print(f"\n📋 Sample cities:")
-    for i, (key, value) in enumerate(sorted(cities.items())[:20]):
+    for key, value in sample:
         print(f"   {value['display_name']:35} → {value['url_format']}")
     
     print("\n" + "="*80 + "\n")
     
-    return cities
+    return {name: _copy_city(data) for name, data in cities.items()}
 
 
 if __name__ == "__main__":
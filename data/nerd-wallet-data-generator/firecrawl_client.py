@@ -0,0 +1,112 @@
+"""
+Shared Firecrawl helpers for the NerdWallet data tools.
+Scrape results are cached on disk so repeated runs don't re-scrape (and re-pay for) the same URLs.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from agno.tools.firecrawl import FirecrawlTools
+
+# The generator scripts run from this directory; put the repo root on the path for the shared helpers
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from sub_agents.disk_cache import cache_get, cache_set
+
+# Where cached scrapes live unless FIRECRAWL_CACHE_DIR is set
+DEFAULT_CACHE_DIR = "../data/.firecrawl_cache"
+
+# How long a cached scrape stays fresh (seconds)
+DEFAULT_TTL = 7 * 24 * 60 * 60
+
+
+@lru_cache(maxsize=1)
+def get_firecrawl() -> FirecrawlTools:
+    """
+    Shared FirecrawlTools client, so every scrape reuses the same HTTP session.
+    """
+    return FirecrawlTools()
+
+
+def _read_cache(url: str, ttl: float):
+    """Cached scrape for a URL, or None if missing or older than ttl seconds"""
+    return cache_get("firecrawl", url, ttl, cache_dir=os.getenv("FIRECRAWL_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _write_cache(url: str, result: str):
+    """Store a scrape in the shared on-disk cache"""
+    cache_set("firecrawl", url, result, cache_dir=os.getenv("FIRECRAWL_CACHE_DIR", DEFAULT_CACHE_DIR))
+
+
+def _field(obj, *names):
+    """First non-None field from a dict or an SDK response object"""
+    for name in names:
+        value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def scrape_cached(firecrawl, url: str, ttl: float = DEFAULT_TTL):
+    """
+    Scrape a URL with Firecrawl, reusing a cached result if it is still fresh.
+
+    Args:
+        firecrawl: FirecrawlTools instance used on a cache miss
+        url: The URL to scrape
+        ttl: Maximum age of a cached result (seconds)
+
+    Returns:
+        The scrape result (same as firecrawl.scrape_website)
+    """
+    cached = _read_cache(url, ttl)
+    if cached is not None:
+        return cached
+
+    result = firecrawl.scrape_website(url)
+
+    # Only text results can be cached
+    if isinstance(result, str):
+        _write_cache(url, result)
+
+    return result
+
+
+def batch_scrape_cached(urls: list, ttl: float = DEFAULT_TTL) -> dict:
+    """
+    Scrape many URLs with a single Firecrawl batch request, reusing fresh cached results.
+
+    Args:
+        urls: The URLs to scrape
+        ttl: Maximum age of a cached result (seconds)
+
+    Returns:
+        Dictionary mapping each URL to its scraped markdown (URLs with no document are omitted)
+    """
+    pages = {}
+    missing = []
+    for url in urls:
+        cached = _read_cache(url, ttl)
+        if cached is None:
+            missing.append(url)
+        else:
+            pages[url] = cached
+
+    if not missing:
+        return pages
+
+    response = get_firecrawl().app.batch_scrape_urls(missing, formats=["markdown"])
+    documents = _field(response, "data") or []
+
+    for document in documents:
+        metadata = _field(document, "metadata") or {}
+        url = _field(metadata, "sourceURL", "source_url", "url")
+        # Batch results aren't guaranteed to come back in submission order, so a document that
+        # doesn't name one of our URLs can't be attributed; skip it rather than guess
+        markdown = _field(document, "markdown")
+        if url in missing and markdown is not None:
+            _write_cache(url, markdown)
+            pages[url] = markdown
+
+    return pages
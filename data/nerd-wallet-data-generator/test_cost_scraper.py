@@ -5,8 +5,10 @@ This script tests the scraping functionality independently.
 
 import os
 import re
+import string
+import unicodedata
 from dotenv import load_dotenv
-from agno.tools.firecrawl import FirecrawlTools
+from firecrawl_client import get_firecrawl, scrape_cached
 
 # Load environment variables
 load_dotenv()
@@ -21,17 +23,66 @@ else:
     print(f"✅ FIRECRAWL_API_KEY found: {firecrawl_key[:8]}...")
 
 
+# Trailing state abbreviations / full state names, compiled once
+_STATE_ABBRS = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+)
+_STATE_NAMES = (
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+    "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+    "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+    "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+    "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming",
+)
+# One alternation, longest first so "West Virginia" wins over "Virginia" / "VA"
+_STATE_RE = re.compile(
+    r',?\s*(' + '|'.join(sorted(_STATE_ABBRS + _STATE_NAMES, key=len, reverse=True)) + r')\s*$',
+    re.IGNORECASE,
+)
+
+# Deletes every ASCII character that can't appear in a URL slug (non-ASCII is folded away first)
+_URL_KEEP = frozenset(string.ascii_lowercase + string.digits + '-')
+_URL_DELETE = str.maketrans('', '', ''.join(chr(i) for i in range(128) if chr(i) not in _URL_KEEP))
+
+# Data validation markers, checked in a single pass over the scraped page
+_DATA_CHECK_RE = re.compile(
+    r'(?P<cost_of_living>cost of living)|(?P<housing>housing)|(?P<transportation>transportation)|(?P<money>[%$])',
+    re.IGNORECASE,
+)
+
+# Lowercased state tokens for the common "City, ST" / "City, State" shape
+_STATE_SUFFIXES = frozenset(state.lower() for state in _STATE_ABBRS + _STATE_NAMES)
+
+
+def _strip_state(city_name: str) -> str:
+    """Remove a trailing state abbreviation or full state name from a city name"""
+    # Fast path: state after the last comma is a single set lookup
+    city, sep, tail = city_name.rpartition(',')
+    if sep and tail.strip().lower() in _STATE_SUFFIXES:
+        return city
+    
+    # Fall back to the regex for inputs like "Dallas TX"
+    return _STATE_RE.sub('', city_name, count=1)
+
+
 def format_city_for_url(city_name: str) -> str:
     """Format city name for NerdWallet URL (lowercase, spaces to dashes, remove state if present)"""
     # Remove common state abbreviations and full state names
-    city_clean = re.sub(r',?\s*(AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)\s*$', '', city_name, flags=re.IGNORECASE)
-    city_clean = re.sub(r',?\s*(Alabama|Alaska|Arizona|Arkansas|California|Colorado|Connecticut|Delaware|Florida|Georgia|Hawaii|Idaho|Illinois|Indiana|Iowa|Kansas|Kentucky|Louisiana|Maine|Maryland|Massachusetts|Michigan|Minnesota|Mississippi|Missouri|Montana|Nebraska|Nevada|New Hampshire|New Jersey|New Mexico|New York|North Carolina|North Dakota|Ohio|Oklahoma|Oregon|Pennsylvania|Rhode Island|South Carolina|South Dakota|Tennessee|Texas|Utah|Vermont|Virginia|Washington|West Virginia|Wisconsin|Wyoming)\s*$', '', city_clean, flags=re.IGNORECASE)
+    city_clean = _strip_state(city_name)
     
     # Convert to lowercase and replace spaces with dashes
     city_formatted = city_clean.strip().lower().replace(' ', '-')
     
+    # Fold accents ("Montréal" -> "montreal") and drop anything else non-ASCII
+    if not city_formatted.isascii():
+        city_formatted = unicodedata.normalize('NFKD', city_formatted).encode('ascii', 'ignore').decode('ascii')
+    
     # Remove any special characters except dashes
-    city_formatted = re.sub(r'[^a-z0-9-]', '', city_formatted)
+    city_formatted = city_formatted.translate(_URL_DELETE)
     
     return city_formatted
 
@@ -85,12 +136,12 @@ def test_scraper(current_city: str, desired_city: str):
     
     try:
         # Initialize Firecrawl
-        firecrawl = FirecrawlTools()
+        firecrawl = get_firecrawl()
         print(f"✅ FirecrawlTools initialized successfully")
         
         # Attempt to scrape
         print(f"⏳ Scraping URL (this may take 10-30 seconds)...")
-        result = firecrawl.scrape_website(url)
+        result = scrape_cached(firecrawl, url)
         
         print(f"✅ Scraping completed!")
         print(f"\n{'='*80}")
@@ -117,12 +168,18 @@ def test_scraper(current_city: str, desired_city: str):
         print("DATA VALIDATION")
         print("="*80)
         
-        result_str = str(result).lower()
+        result_str = result if isinstance(result, str) else str(result)
+        found = set()
+        for match in _DATA_CHECK_RE.finditer(result_str):
+            found.add(match.lastgroup)
+            if len(found) == _DATA_CHECK_RE.groups:
+                break
+        
         checks = [
-            ("Contains 'cost of living'", "cost of living" in result_str),
-            ("Contains 'housing'", "housing" in result_str),
-            ("Contains 'transportation'", "transportation" in result_str),
-            ("Contains percentage or dollar signs", ("%" in result_str or "$" in result_str)),
+            ("Contains 'cost of living'", "cost_of_living" in found),
+            ("Contains 'housing'", "housing" in found),
+            ("Contains 'transportation'", "transportation" in found),
+            ("Contains percentage or dollar signs", "money" in found),
         ]
         
         for check_name, passed in checks:
@@ -4,12 +4,69 @@ This script tests URLs and identifies which ones work vs which need correction.
 """
 
 import json
+import mmap
+import os
+import random
+import re
+import sys
 import time
-from agno.tools.firecrawl import FirecrawlTools
+from typing import Optional
+import orjson
 from dotenv import load_dotenv
+from firecrawl_client import batch_scrape_cached, get_firecrawl, scrape_cached
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
 
 load_dotenv()
 
+# Markers of a real comparison page vs an error page
+_VALID_RE = re.compile(r'housing costs|cost of living', re.IGNORECASE)
+_NOTFOUND_RE = re.compile(r'not found|404', re.IGNORECASE)
+
+
+def load_cities(cities_file: str) -> dict:
+    """
+    Load the city database, parsing straight from a read-only memory map of the file.
+    
+    Args:
+        cities_file: Path to city database JSON
+    
+    Returns:
+        Dictionary of display name -> city data
+    """
+    with open(cities_file, 'rb') as f:
+        # mmap can't map an empty file; let the JSON parser report it
+        if os.fstat(f.fileno()).st_size == 0:
+            return orjson.loads(b"")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # orjson parses the mapped pages directly, without copying the file into a bytes object
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def comparison_url(city1_url: str, city2_url: str = "dallas-tx") -> str:
+    """NerdWallet comparison page URL for two city URL formats"""
+    return f"https://www.nerdwallet.com/cost-of-living-calculator/compare/{city1_url}-vs-{city2_url}"
+
+
+def classify_page(result) -> tuple:
+    """
+    Classify a scraped comparison page.
+    
+    Returns:
+        (is_valid, status_code, error_message)
+    """
+    # Check if we got actual cost data (not an error page)
+    result_str = result if isinstance(result, str) else str(result)
+    
+    if _VALID_RE.search(result_str):
+        return (True, 200, None)
+    elif _NOTFOUND_RE.search(result_str):
+        return (False, 404, "City not found")
+    else:
+        return (False, 0, "Unknown response")
+
+
 def test_city_url(city1_url: str, city2_url: str = "dallas-tx") -> tuple:
     """
     Test if a city URL is valid by attempting to scrape a comparison page.
@@ -21,54 +78,62 @@ def test_city_url(city1_url: str, city2_url: str = "dallas-tx") -> tuple:
     Returns:
         (is_valid, status_code, error_message)
     """
-    url = f"https://www.nerdwallet.com/cost-of-living-calculator/compare/{city1_url}-vs-{city2_url}"
+    url = comparison_url(city1_url, city2_url)
     
     try:
-        firecrawl = FirecrawlTools()
-        result = firecrawl.scrape_website(url)
-        
-        # Check if we got actual cost data (not an error page)
-        result_str = str(result).lower()
-        
-        if "housing costs" in result_str or "cost of living" in result_str:
-            return (True, 200, None)
-        elif "not found" in result_str or "404" in result_str:
-            return (False, 404, "City not found")
-        else:
-            return (False, 0, "Unknown response")
+        firecrawl = get_firecrawl()
+        result = scrape_cached(firecrawl, url)
+        return classify_page(result)
             
     except Exception as e:
         return (False, 0, str(e))
 
 
+def suggest_correction(bad_url: str, cities: dict) -> Optional[str]:
+    """
+    Suggest the closest known URL format for one that failed validation.
+    
+    Args:
+        bad_url: The URL format that could not be found
+        cities: City database (display name -> city data)
+    
+    Returns:
+        The closest other url_format in the database, or None if there is none
+    """
+    candidates = [city_data['url_format'] for city_data in cities.values()
+                  if city_data['url_format'] != bad_url]
+    if not candidates:
+        return None
+    
+    # Bit-parallel Levenshtein; every URL format fits in a single machine word
+    match = process.extractOne(bad_url, candidates, scorer=Levenshtein.normalized_similarity)
+    return match[0]
+
+
 def validate_city_database(cities_file: str = "../data/nerdwallet_cities_comprehensive.json", 
                           sample_size: int = 20,
-                          delay: float = 2.0):
+                          progress_every: int = 10):
     """
     Validate a sample of cities from the database.
     
     Args:
         cities_file: Path to city database JSON
         sample_size: Number of cities to test
-        delay: Delay between requests (seconds) to avoid rate limiting
+        progress_every: Number of results to buffer before writing them to the terminal
     """
     print("="*80)
     print("CITY DATABASE VALIDATION")
     print("="*80)
     
     # Load cities
-    with open(cities_file, 'r', encoding='utf-8') as f:
-        cities = json.load(f)
+    cities = load_cities(cities_file)
     
     print(f"\n📚 Loaded {len(cities)} cities from database")
-    print(f"🧪 Testing sample of {sample_size} cities...")
-    print(f"⏱️  Delay between requests: {delay} seconds\n")
+    print(f"🧪 Testing sample of {sample_size} cities in one batch request...\n")
     
     # Sample cities to test
-    import random
-    city_items = list(cities.items())
-    random.shuffle(city_items)
-    sample = city_items[:sample_size]
+    sample_names = random.sample(list(cities), min(sample_size, len(cities)))
+    sample = [(name, cities[name]) for name in sample_names]
     
     results = {
         "valid": [],
@@ -76,41 +141,56 @@ def validate_city_database(cities_file: str = "../data/nerdwallet_cities_compreh
         "errors": []
     }
     
+    # Scrape every sampled city in a single Firecrawl batch job
+    urls = {comparison_url(city_data['url_format']): city_data for _, city_data in sample}
+    batch_error = None
+    try:
+        pages = batch_scrape_cached(list(urls))
+    except Exception as e:
+        pages = {}
+        batch_error = str(e)
+    
     print("Testing cities:")
     print("-"*80)
     
-    for i, (city_key, city_data) in enumerate(sample, 1):
+    # Progress lines are written in blocks to keep terminal writes and flushes down
+    pending_lines = []
+    
+    for i, (url, city_data) in enumerate(urls.items(), 1):
         url_format = city_data['url_format']
         display_name = city_data['display_name']
         
-        print(f"{i:2d}. Testing: {display_name:30} ({url_format})...", end=" ", flush=True)
-        
-        is_valid, status, error = test_city_url(url_format)
+        if url in pages:
+            is_valid, status, error = classify_page(pages[url])
+        else:
+            is_valid, status, error = (False, 0, batch_error or "No result returned")
         
         if is_valid:
-            print("✅ VALID")
+            outcome = "✅ VALID"
             results["valid"].append({
                 "display_name": display_name,
                 "url_format": url_format
             })
         elif status == 404:
-            print("❌ NOT FOUND")
+            outcome = "❌ NOT FOUND"
             results["invalid"].append({
                 "display_name": display_name,
                 "url_format": url_format,
                 "error": error
             })
         else:
-            print(f"⚠️  ERROR: {error}")
+            outcome = f"⚠️  ERROR: {error}"
             results["errors"].append({
                 "display_name": display_name,
                 "url_format": url_format,
                 "error": error
             })
         
-        # Delay to avoid rate limiting
-        if i < len(sample):
-            time.sleep(delay)
+        pending_lines.append(f"{i:2d}. Testing: {display_name:30} ({url_format})... {outcome}\n")
+        if len(pending_lines) >= progress_every or i == len(urls):
+            sys.stdout.write("".join(pending_lines))
+            sys.stdout.flush()
+            pending_lines.clear()
     
     # Print summary
     print("\n" + "="*80)
@@ -143,14 +223,21 @@ def validate_city_database(cities_file: str = "../data/nerdwallet_cities_compreh
     return results
 
 
-def check_specific_cities():
+def check_specific_cities(cities_file: str = "../data/nerdwallet_cities_comprehensive.json"):
     """
     Check specific known cities to understand NerdWallet's format.
+    
+    Args:
+        cities_file: Path to city database JSON, used to suggest corrections for failing URLs
     """
     print("\n" + "="*80)
     print("CHECKING SPECIFIC KNOWN CITIES")
     print("="*80)
     
+    cities = {}
+    if os.path.exists(cities_file):
+        cities = load_cities(cities_file)
+    
     # Test known variations
     test_cases = [
         ("New York City", "new-york-city-ny"),
@@ -173,6 +260,9 @@ def check_specific_cities():
             print("✅ WORKS")
         else:
             print(f"❌ FAILS ({status})")
+            suggestion = suggest_correction(url_format, cities) if status == 404 else None
+            if suggestion:
+                print(f"   💡 Closest known format: {suggestion}")
         
         time.sleep(1.5)
     
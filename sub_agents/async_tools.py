@@ -0,0 +1,25 @@
+"""
+Async adapters for the blocking sub-agent tools.
+The team runs its members on one event loop (Team.arun), so a sync tool doing network I/O there
+would stall the other members; wrapped tools run on a worker thread instead.
+"""
+
+import asyncio
+import functools
+
+
+def threaded_tool(func):
+    """
+    Wrap a blocking tool function so the agent awaits it on a worker thread.
+
+    Args:
+        func: Sync tool function (its name, docstring and signature still describe the tool)
+
+    Returns:
+        Async function with the same name and parameters
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
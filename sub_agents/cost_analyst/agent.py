@@ -1,6 +1,7 @@
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from sub_agents.schemas import CostAnalysis
+from sub_agents.async_tools import threaded_tool
 from .tools import get_cost_of_living_comparison
 
 cost_analyst = Agent(
@@ -24,7 +25,8 @@ cost_analyst = Agent(
         "Provide practical insights about the financial impact using the real data",
         "If the tool fails, fall back to general knowledge but note this in your analysis"
     ],
-    tools=[get_cost_of_living_comparison],
+    # Run the blocking HTTP call off the event loop so the team's members overlap
+    tools=[threaded_tool(get_cost_of_living_comparison)],
     output_schema=CostAnalysis,
     markdown=True,
 )
@@ -1,19 +1,59 @@
-import json
 import re
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Final, FrozenSet, List, Mapping, Optional, Tuple
 from difflib import get_close_matches
+import orjson
 from agno.tools.firecrawl import FirecrawlTools
+from rapidfuzz import fuzz, process
+from sub_agents.disk_cache import cache_get, cache_set
+from sub_agents.log import get_logger
+
+logger = get_logger(__name__)
 
 # Load city database for URL formatting
 CITY_DATABASE = {}
 try:
-    with open("data/nerdwallet_cities_comprehensive.json", "r", encoding="utf-8") as f:
-        CITY_DATABASE = json.load(f)
-    print(f"✅ Loaded {len(CITY_DATABASE)} cities from database")
+    with open("data/nerdwallet_cities_comprehensive.json", "rb") as f:
+        raw = f.read()
+    CITY_DATABASE = orjson.loads(raw)
+    logger.info(f"✅ Loaded {len(CITY_DATABASE)} cities from database")
 except FileNotFoundError:
-    print("⚠️  City database not found. Run 'python data/nerd-wallet-data-generator/create_city_database.py' first.")
-    print("   Falling back to basic URL formatting.")
+    logger.warning("⚠️  City database not found. Run 'python data/nerd-wallet-data-generator/create_city_database.py' first.")
+    logger.info("   Falling back to basic URL formatting.")
+
+# Common city aliases -> database key (read-only; resolved into _LC_INDEX once at import)
+_ALIAS_MAP: Final[Mapping[str, str]] = MappingProxyType({
+    "nyc": "New York (Manhattan), NY",
+    "new york city": "New York (Manhattan), NY",
+    "brooklyn": "New York (Brooklyn), NY",
+    "manhattan": "New York (Manhattan), NY",
+    "queens": "New York (Queens), NY",
+    "bronx": "New York (Bronx), NY",
+    "staten island": "New York (Staten Island), NY",
+    "la": "Los Angeles, CA",
+    "sf": "San Francisco, CA",
+    "san fran": "San Francisco, CA",
+    "philly": "Philadelphia, PA",
+    "vegas": "Las Vegas, NV",
+})
+
+# Lookup indexes over CITY_DATABASE, built once so matching doesn't rescan the database per call
+_LC_INDEX: Final[Dict[str, dict]] = {}         # lowercased key / city / display name / alias -> city data (first entry wins)
+_DISPLAY_TO_DATA: Final[Dict[str, dict]] = {}  # display name -> city data (first entry wins)
+for _key, _data in CITY_DATABASE.items():
+    _LC_INDEX.setdefault(_key.lower(), _data)
+    _LC_INDEX.setdefault(_data['city'].lower(), _data)
+    _LC_INDEX.setdefault(_data.get('display_name', '').lower(), _data)
+    _DISPLAY_TO_DATA.setdefault(_data.get('display_name', _key), _data)
+# Aliases only apply when no real city matches, so they go in after the database entries
+for _alias, _key in _ALIAS_MAP.items():
+    if _key in CITY_DATABASE:
+        _LC_INDEX.setdefault(_alias, CITY_DATABASE[_key])
+_DISPLAY_NAMES: Final[List[str]] = [city_data.get('display_name', key) for key, city_data in CITY_DATABASE.items()]
 
+
+@lru_cache(maxsize=512)
 def find_best_city_match(city_name: str, cutoff: float = 0.6) -> Optional[dict]:
     """
     Find the best matching city from the database using fuzzy matching.
@@ -31,50 +71,54 @@ def find_best_city_match(city_name: str, cutoff: float = 0.6) -> Optional[dict]:
     # Normalize input
     city_name = city_name.strip()
     
-    # Try exact match first (case-insensitive)
-    for city_key, city_data in CITY_DATABASE.items():
-        if city_key.lower() == city_name.lower():
-            return city_data
-        if city_data['city'].lower() == city_name.lower():
-            return city_data
-        if city_data.get('display_name', '').lower() == city_name.lower():
-            return city_data
-    
-    # Check if this is an alias
     city_lower = city_name.lower()
-    alias_map = {
-        "nyc": "New York (Manhattan), NY",
-        "new york city": "New York (Manhattan), NY",
-        "brooklyn": "New York (Brooklyn), NY",
-        "manhattan": "New York (Manhattan), NY",
-        "queens": "New York (Queens), NY",
-        "bronx": "New York (Bronx), NY",
-        "staten island": "New York (Staten Island), NY",
-        "la": "Los Angeles, CA",
-        "sf": "San Francisco, CA",
-        "san fran": "San Francisco, CA",
-        "philly": "Philadelphia, PA",
-        "vegas": "Las Vegas, NV",
-    }
-    
-    if city_lower in alias_map:
-        alias_key = alias_map[city_lower]
-        if alias_key in CITY_DATABASE:
-            return CITY_DATABASE[alias_key]
-    
-    # Try fuzzy matching on display names
-    display_names = [city_data.get('display_name', key) for key, city_data in CITY_DATABASE.items()]
-    matches = get_close_matches(city_name, display_names, n=1, cutoff=cutoff)
+    
+    # Try exact match or alias first (case-insensitive)
+    hit = _LC_INDEX.get(city_lower)
+    if hit is not None:
+        return hit
+    
+    # Try fuzzy matching on display names. RapidFuzz's ratio (on the raw strings) is never below
+    # difflib's, so it cheaply narrows the names to a superset of difflib's matches; difflib then
+    # makes the final pick so cities outside the database still fall through to basic formatting.
+    candidates = [
+        name for name, _, _ in process.extract(
+            city_name, _DISPLAY_NAMES,
+            scorer=fuzz.ratio, processor=None, score_cutoff=cutoff * 100 - 1e-6, limit=None
+        )
+    ]
+    matches = get_close_matches(city_name, candidates, n=1, cutoff=cutoff)
     
     if matches:
-        # Find the city data for this match
-        for city_key, city_data in CITY_DATABASE.items():
-            if city_data.get('display_name', city_key) == matches[0]:
-                return city_data
+        return _DISPLAY_TO_DATA[matches[0]]
     
     return None
 
 
+# Trailing state abbreviations / full state names for the basic URL formatting fallback
+_STATE_ABBRS: Final[Tuple[str, ...]] = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS", "KY",
+    "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND",
+    "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+)
+_STATE_NAMES: Final[Tuple[str, ...]] = (
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware",
+    "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky",
+    "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi",
+    "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico",
+    "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania",
+    "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont",
+    "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming",
+)
+_STATE_ABBR_RE: Final = re.compile(r',?\s*(' + '|'.join(_STATE_ABBRS) + r')\s*$', re.IGNORECASE)
+_STATE_NAME_RE: Final = re.compile(r',?\s*(' + '|'.join(_STATE_NAMES) + r')\s*$', re.IGNORECASE)
+_NON_URL_RE: Final = re.compile(r'[^a-z0-9-]')
+
+# Lowercased state tokens for the common "City, ST" / "City, State" shape
+_STATE_SUFFIXES: Final[FrozenSet[str]] = frozenset(state.lower() for state in _STATE_ABBRS + _STATE_NAMES)
+
+
+@lru_cache(maxsize=1024)
 def format_city_for_url(city_name: str) -> str:
     """
     Format city name for NerdWallet URL using the city database.
@@ -93,21 +137,58 @@ def format_city_for_url(city_name: str) -> str:
         return city_match['url_format']
     
     # Fallback to basic formatting if not in database
-    print(f"   ⚠️  City '{city_name}' not found in database, using basic formatting")
+    logger.warning(f"   ⚠️  City '{city_name}' not found in database, using basic formatting")
     
     # Remove common state abbreviations and full state names
-    city_clean = re.sub(r',?\s*(AL|AK|AZ|AR|CA|CO|CT|DE|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY)\s*$', '', city_name, flags=re.IGNORECASE)
-    city_clean = re.sub(r',?\s*(Alabama|Alaska|Arizona|Arkansas|California|Colorado|Connecticut|Delaware|Florida|Georgia|Hawaii|Idaho|Illinois|Indiana|Iowa|Kansas|Kentucky|Louisiana|Maine|Maryland|Massachusetts|Michigan|Minnesota|Mississippi|Missouri|Montana|Nebraska|Nevada|New Hampshire|New Jersey|New Mexico|New York|North Carolina|North Dakota|Ohio|Oklahoma|Oregon|Pennsylvania|Rhode Island|South Carolina|South Dakota|Tennessee|Texas|Utah|Vermont|Virginia|Washington|West Virginia|Wisconsin|Wyoming)\s*$', '', city_clean, flags=re.IGNORECASE)
+    city_clean, sep, tail = city_name.rpartition(',')
+    if not (sep and tail.strip().lower() in _STATE_SUFFIXES):
+        # No "City, ST" tail; fall back to the regexes for inputs like "Dallas TX"
+        city_clean = _STATE_ABBR_RE.sub('', city_name)
+        city_clean = _STATE_NAME_RE.sub('', city_clean)
     
     # Convert to lowercase and replace spaces with dashes
     city_formatted = city_clean.strip().lower().replace(' ', '-')
     
     # Remove any special characters except dashes
-    city_formatted = re.sub(r'[^a-z0-9-]', '', city_formatted)
+    city_formatted = _NON_URL_RE.sub('', city_formatted)
     
     return city_formatted
 
 
+# Maximum characters of scraped page passed to the agent (full pages can exceed 100KB of markdown)
+_MAX_SCRAPE_CHARS: Final = 20_000
+
+# Shared FirecrawlTools client, created on first use (constructing it needs FIRECRAWL_API_KEY)
+_FIRECRAWL: Optional[FirecrawlTools] = None
+
+
+def _get_firecrawl() -> FirecrawlTools:
+    """Return the shared FirecrawlTools client, creating it on first use"""
+    global _FIRECRAWL
+    if _FIRECRAWL is None:
+        _FIRECRAWL = FirecrawlTools()
+    return _FIRECRAWL
+
+
+def _scrape_comparison(url: str):
+    """
+    Scrape a NerdWallet comparison page, reusing a result cached on disk within the last 24 hours.
+    """
+    cached = cache_get("nerdwallet", url)
+    if cached is not None:
+        logger.info(f"   💾 Using cached NerdWallet data")
+        return cached
+    
+    # Use the shared Firecrawl client to scrape the page
+    result = _get_firecrawl().scrape_website(url)
+    
+    # Only text results can be cached
+    if isinstance(result, str):
+        cache_set("nerdwallet", url, result)
+    
+    return result
+
+
 def get_cost_of_living_comparison(current_city: str, desired_city: str) -> str:
     """
     Get cost of living comparison between two cities from NerdWallet.
@@ -131,24 +212,26 @@ def get_cost_of_living_comparison(current_city: str, desired_city: str) -> str:
     url = f"https://www.nerdwallet.com/cost-of-living-calculator/compare/{current_formatted}-vs-{desired_formatted}"
     
     # Console log
-    print(f"\n🔍 [COST TOOL] Fetching real cost of living data...")
-    print(f"   Current City: {current_city}")
+    logger.info(f"\n🔍 [COST TOOL] Fetching real cost of living data...")
+    logger.info(f"   Current City: {current_city}")
     if current_match:
-        print(f"   ├─ Matched to: {current_match['display_name']}")
-    print(f"   └─ URL format: {current_formatted}")
-    print(f"   Desired City: {desired_city}")
+        logger.info(f"   ├─ Matched to: {current_match['display_name']}")
+    logger.info(f"   └─ URL format: {current_formatted}")
+    logger.info(f"   Desired City: {desired_city}")
     if desired_match:
-        print(f"   ├─ Matched to: {desired_match['display_name']}")
-    print(f"   └─ URL format: {desired_formatted}")
-    print(f"   URL: {url}")
-    print(f"   ⏳ Scraping data with Firecrawl...\n")
+        logger.info(f"   ├─ Matched to: {desired_match['display_name']}")
+    logger.info(f"   └─ URL format: {desired_formatted}")
+    logger.info(f"   URL: {url}")
+    logger.info(f"   ⏳ Scraping data with Firecrawl...\n")
     
     try:
-        # Use Firecrawl to scrape the page
-        firecrawl = FirecrawlTools()
-        result = firecrawl.scrape_website(url)
+        # Scrape the page (or reuse a cached scrape)
+        result = _scrape_comparison(url)
+        
+        logger.info(f"✅ [COST TOOL] Successfully retrieved cost of living data!\n")
         
-        print(f"✅ [COST TOOL] Successfully retrieved cost of living data!\n")
+        # The comparison figures are near the top of the page; cap what goes into the prompt
+        result = str(result)[:_MAX_SCRAPE_CHARS]
         
         # Return the scraped content
         return f"""
@@ -169,8 +252,8 @@ Please extract and analyze the following from the above data:
 Use these real-world data points in your analysis.
 """
     except Exception as e:
-        print(f"⚠️ [COST TOOL] Error fetching data: {e}")
-        print(f"   Falling back to general knowledge analysis\n")
+        logger.warning(f"⚠️ [COST TOOL] Error fetching data: {e}")
+        logger.info(f"   Falling back to general knowledge analysis\n")
         return f"""
 Unable to fetch real-time cost of living data from NerdWallet.
 URL attempted: {url}
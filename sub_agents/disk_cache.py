@@ -0,0 +1,72 @@
+"""
+Small on-disk cache for slow, paid lookups (web scrapes, API calls) shared by the sub-agent tools
+and the NerdWallet data generator scripts.
+Entries are text files keyed by the SHA-256 of the key and expire based on their modification time.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from sub_agents.log import get_logger
+
+logger = get_logger(__name__)
+
+# Root directory for cached entries unless SHOULD_I_MOVE_CACHE_DIR is set
+DEFAULT_CACHE_DIR = ".cache"
+
+# How long a cached entry stays fresh (seconds)
+DEFAULT_TTL = 24 * 60 * 60
+
+
+def _cache_path(namespace: str, key: str, cache_dir: Optional[str]) -> Path:
+    """Cache file for a key within a namespace (e.g. "nerdwallet")"""
+    # Read the env var per call so values loaded later by load_dotenv() still apply
+    root = Path(cache_dir or os.getenv("SHOULD_I_MOVE_CACHE_DIR", DEFAULT_CACHE_DIR))
+    return root / namespace / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.txt"
+
+
+def cache_get(namespace: str, key: str, ttl: float = DEFAULT_TTL, cache_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Look up a cached value.
+
+    Args:
+        namespace: Cache sub-directory, one per data source
+        key: Lookup key (e.g. the scraped URL)
+        ttl: Maximum age of a cached value (seconds)
+        cache_dir: Root directory to use instead of the default
+
+    Returns:
+        The cached text, or None if missing or older than ttl
+    """
+    path = _cache_path(namespace, key, cache_dir)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            return path.read_text(encoding="utf-8")
+    except OSError:
+        pass
+    return None
+
+
+def cache_set(namespace: str, key: str, value: str, cache_dir: Optional[str] = None):
+    """
+    Store a value, writing atomically so concurrent writers don't clash.
+
+    Args:
+        namespace: Cache sub-directory, one per data source
+        key: Lookup key (e.g. the scraped URL)
+        value: Text to cache
+        cache_dir: Root directory to use instead of the default
+    """
+    path = _cache_path(namespace, key, cache_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(value, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Caching is best-effort; a read-only or full disk shouldn't fail the lookup itself
+        logger.warning(f"   ⚠️  Could not write cache entry: {e}")
@@ -0,0 +1,49 @@
+"""
+Console logging for the sub-agent tools.
+Records go through a queue to a background thread that writes them to stdout, so tool calls
+running on worker threads don't block on terminal I/O.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# Parent logger for every module under sub_agents
+_ROOT_NAME = "sub_agents"
+
+
+def _configure():
+    """Attach the queue handler and start the stdout listener (once per process)"""
+    root = logging.getLogger(_ROOT_NAME)
+    if root.handlers:
+        return
+
+    records = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stdout)
+    # Tool messages already carry their own emoji prefixes, so print them as-is
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    listener = QueueListener(records, console)
+    listener.start()
+    # Flush queued messages before the interpreter exits
+    atexit.register(listener.stop)
+
+    root.addHandler(QueueHandler(records))
+    root.setLevel(logging.INFO)
+    root.propagate = False
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Logger for a sub_agents module (pass __name__).
+
+    Args:
+        name: Module name, e.g. "sub_agents.cost_analyst.tools"
+
+    Returns:
+        Logger that writes to stdout through the shared background listener
+    """
+    _configure()
+    return logging.getLogger(name)
@@ -1,6 +1,7 @@
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from sub_agents.schemas import MigrationInsights
+from sub_agents.async_tools import threaded_tool
 from .tools import search_reddit_discussions
 
 migration_researcher = Agent(
@@ -30,7 +31,8 @@ migration_researcher = Agent(
         "Provide a balanced summary of migration experiences based on the Reddit search results",
         "If the function returns an error or no results, set 'reddit_insights_included' to False and use general knowledge"
     ],
-    tools=[search_reddit_discussions],
+    # Run the blocking HTTP call off the event loop so the team's members overlap
+    tools=[threaded_tool(search_reddit_discussions)],
     output_schema=MigrationInsights,
     markdown=True,
 )
@@ -3,6 +3,11 @@ import time
 import requests
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sub_agents.log import get_logger
+
+logger = get_logger(__name__)
 
 
 class BraveSearchResult(BaseModel):
@@ -12,10 +17,57 @@ class BraveSearchResult(BaseModel):
     description: str
 
 
+# Respect rate limits (1 request per second for free tier)
+_BRAVE_REQUEST_SPACING = 1.1
+
+# Shared HTTP session so the queries reuse pooled TLS connections to the Brave API.
+# Transient 429/502/503 responses are retried (honouring Retry-After); if retries run out
+# the last response is returned so the status handling below still applies.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503], raise_on_status=False),
+))
+_SESSION.headers.update({
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip",
+})
+
+# Brave Search API limits: results per request, and query length before it gets truncated
+_BRAVE_MAX_COUNT = 20
+_BRAVE_MAX_QUERY_LENGTH = 400
+
+
+def _build_queries(current_city: str, desired_city: str) -> List[str]:
+    """
+    Build the Reddit search queries for a move, OR-ing the phrasings into as few queries as possible.
+    
+    Returns:
+        One query, or two if a single OR query would exceed the Brave query length limit
+    """
+    phrases = [
+        f'"should I move from {current_city} to {desired_city}"',
+        f'"moved from {current_city} to {desired_city}"',
+        f'"{current_city} to {desired_city}"',
+        f'"{desired_city} vs {current_city}"',
+    ]
+    
+    query = f"site:reddit.com ({' OR '.join(phrases)})"
+    if len(query) <= _BRAVE_MAX_QUERY_LENGTH:
+        return [query]
+    
+    half = len(phrases) // 2
+    return [
+        f"site:reddit.com ({' OR '.join(phrases[:half])})",
+        f"site:reddit.com ({' OR '.join(phrases[half:])})",
+    ]
+
+
 def search_reddit_discussions(
     current_city: str,
     desired_city: str,
-    max_results: int = 10
+    max_results: int = 20
 ) -> str:
     """
     Search Reddit for discussions about moving between two cities using Brave Search API.
@@ -23,7 +75,7 @@ def search_reddit_discussions(
     Args:
         current_city: The city the user is moving from
         desired_city: The city the user is moving to
-        max_results: Maximum number of results to return per query (default: 10)
+        max_results: Maximum number of results to return per query (default: 20, the Brave API maximum)
         
     Returns:
         Formatted string with search results from Reddit discussions
@@ -33,35 +85,30 @@ def search_reddit_discussions(
     if not api_key:
         return "ERROR: BRAVE_API_KEY not set in environment variables. Please add it to your .env file."
     
-    # Search queries to try
-    queries = [
-        f"site:reddit.com should I move from {current_city} to {desired_city}",
-        f"site:reddit.com moved from {current_city} to {desired_city}",
-        f"site:reddit.com {current_city} to {desired_city} relocation",
-        f"site:reddit.com {desired_city} vs {current_city}",
-    ]
+    # Search queries to try (normally a single OR query)
+    queries = _build_queries(current_city, desired_city)
     
     all_results = []
     seen_urls = set()
     
-    print(f"\n🔍 [REDDIT SEARCH] Searching for Reddit discussions about moving from {current_city} to {desired_city}...")
+    logger.info(f"\n🔍 [REDDIT SEARCH] Searching for Reddit discussions about moving from {current_city} to {desired_city}...")
     
-    for query in queries:
-        print(f"   📡 Query: {query}")
+    for i, query in enumerate(queries):
+        # Respect rate limits between queries (normally there is only one)
+        if i:
+            time.sleep(_BRAVE_REQUEST_SPACING)
+        
+        logger.info(f"   📡 Query: {query}")
         
         try:
             # Make request to Brave Search API
-            response = requests.get(
+            response = _SESSION.get(
                 "https://api.search.brave.com/res/v1/web/search",
                 params={
                     "q": query,
-                    "count": max_results
-                },
-                headers={
-                    "Accept": "application/json",
-                    "Accept-Encoding": "gzip",
-                    "X-Subscription-Token": api_key
+                    "count": min(max_results, _BRAVE_MAX_COUNT)
                 },
+                headers={"X-Subscription-Token": api_key},
                 timeout=10
             )
             
@@ -71,7 +118,7 @@ def search_reddit_discussions(
                 # Extract web results
                 if "web" in data and "results" in data["web"]:
                     results = data["web"]["results"]
-                    print(f"   ✅ Found {len(results)} results")
+                    logger.info(f"   ✅ Found {len(results)} results")
                     
                     for result in results:
                         url = result.get("url", "")
@@ -85,25 +132,22 @@ def search_reddit_discussions(
                                 "description": result.get("description", "")
                             })
                 else:
-                    print(f"   ⚠️  No results found")
+                    logger.warning(f"   ⚠️  No results found")
             
             elif response.status_code == 401:
                 return "ERROR: Invalid Brave API key. Please check your BRAVE_API_KEY in .env file."
             elif response.status_code == 429:
-                print(f"   ⚠️  Rate limit reached, using results collected so far")
+                logger.warning(f"   ⚠️  Rate limit reached, using results collected so far")
                 break
             else:
-                print(f"   ⚠️  API returned status {response.status_code}")
+                logger.warning(f"   ⚠️  API returned status {response.status_code}")
         
         except requests.exceptions.Timeout:
-            print(f"   ⚠️  Request timed out")
+            logger.warning(f"   ⚠️  Request timed out")
         except Exception as e:
-            print(f"   ⚠️  Error: {e}")
-        
-        # Respect rate limits (1 request per second for free tier)
-        time.sleep(1.1)
+            logger.warning(f"   ⚠️  Error: {e}")
     
-    print(f"\n✅ [REDDIT SEARCH] Collected {len(all_results)} unique Reddit discussions\n")
+    logger.info(f"\n✅ [REDDIT SEARCH] Collected {len(all_results)} unique Reddit discussions\n")
     
     # Format results for the agent
     if not all_results:
@@ -118,21 +162,21 @@ This could mean:
 Please provide insights based on general knowledge about these two cities.
 """
     
-    formatted_results = f"""
+    parts = [f"""
 Reddit Search Results: Moving from {current_city} to {desired_city}
 Found {len(all_results)} Reddit discussions
 
-"""
+"""]
     
     for i, result in enumerate(all_results[:20], 1):  # Limit to top 20
-        formatted_results += f"""
+        parts.append(f"""
 {i}. {result['title']}
    URL: {result['url']}
-   Preview: {result['description'][:200]}...
+   Preview: {result.get('description', '')[:200]}...
 
-"""
+""")
     
-    formatted_results += f"""
+    parts.append(f"""
 
 INSTRUCTIONS FOR ANALYSIS:
 Based on these {len(all_results)} Reddit discussions, extract:
@@ -145,6 +189,6 @@ Based on these {len(all_results)} Reddit discussions, extract:
 
 Set 'reddit_insights_included' to True since we found Reddit data.
 Set 'number_of_sources' to {len(all_results)}.
-"""
+""")
     
-    return formatted_results
+    return "".join(parts)
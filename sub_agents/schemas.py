@@ -1,8 +1,14 @@
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Schema instances are read-only results; unknown fields from model output are dropped
+_SCHEMA_CONFIG = ConfigDict(frozen=True, extra='ignore')
+
 
 class UserProfile(BaseModel):
     """Captures user's financial info and preferences"""
+    model_config = _SCHEMA_CONFIG
+
     current_city: str = Field(..., description="The city the user currently lives in")
     desired_city: str = Field(..., description="The city the user is considering moving to")
     annual_income: Optional[float] = Field(None, description="User's annual income")
@@ -23,6 +29,8 @@ class UserProfile(BaseModel):
 
 class CostAnalysis(BaseModel):
     """Cost of living comparison between cities"""
+    model_config = _SCHEMA_CONFIG
+
     overall_cost_difference: str = Field(
         ..., description="Summary of overall cost difference (e.g., '15% more expensive')"
     )
@@ -37,6 +45,8 @@ class CostAnalysis(BaseModel):
 
 class SentimentAnalysis(BaseModel):
     """City vibe and livability analysis"""
+    model_config = _SCHEMA_CONFIG
+
     overall_sentiment: str = Field(
         ..., description="Overall sentiment about the city (positive/mixed/negative)"
     )
@@ -51,12 +61,16 @@ class SentimentAnalysis(BaseModel):
 
 class Quote(BaseModel):
     """A specific quote with its source"""
+    model_config = _SCHEMA_CONFIG
+
     quote: str = Field(..., description="The text of the quote")
     url: str = Field(..., description="The source URL of the quote")
 
 
 class MigrationInsights(BaseModel):
     """Insights from people who made similar moves"""
+    model_config = _SCHEMA_CONFIG
+
     number_of_sources: int = Field(..., description="Number of migration stories analyzed")
     reddit_insights_included: bool = Field(
         ..., description="Whether Reddit discussions were successfully analyzed"
@@ -85,6 +99,8 @@ class MigrationInsights(BaseModel):
 
 class WikipediaAnalysis(BaseModel):
     """Wikipedia data analysis comparing cities on specific criteria"""
+    model_config = _SCHEMA_CONFIG
+
     criteria_analyzed: str = Field(
         ..., description="The criteria that was analyzed (e.g., 'diversity', 'weather', 'crime')"
     )
@@ -107,6 +123,8 @@ class WikipediaAnalysis(BaseModel):
 
 class FinalRecommendation(BaseModel):
     """Final recommendation with justification"""
+    model_config = _SCHEMA_CONFIG
+
     recommendation: str = Field(
         ..., description="Clear recommendation (e.g., 'Recommend moving', 'Recommend staying', 'More research needed')"
     )
@@ -1,42 +1,282 @@
 import re
-from typing import Optional
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple, Optional
 from agno.tools.wikipedia import WikipediaTools
+from sub_agents.disk_cache import cache_get, cache_set
 
-def extract_numeric_data(text: str, search_terms: list[str]) -> dict:
+# MediaWiki API; the plain-text intro extract holds the headline figures at a fraction of the article size
+_WIKI_API = "https://en.wikipedia.org/w/api.php"
+
+# Shared HTTP session so lookups reuse pooled connections to Wikipedia
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    # Wikimedia asks API clients to identify themselves
+    "User-Agent": "should-i-move/1.0 (https://github.com/Overclock-Accelerator/should-i-move)",
+    "Accept": "application/json",
+})
+
+# Maps the other sentence delimiters to '.', so sentences split with a plain str.split('.')
+_SENT_TBL = str.maketrans({'!': '.', '?': '.'})
+
+# Numeric values (plain, comma-grouped, currency, percentages, scaled like "8.3 million").
+# Commas are only accepted between well-formed thousands groups, so stray punctuation isn't a value.
+_NUM_RE = re.compile(r'\$?(?:\d{1,3}(?:,\d{3}(?!\d))+|\d+)(?:\.\d+)?%?(?: (?:thousand|million|billion|trillion)\b)?')
+
+class _Match(NamedTuple):
+    """A sentence mentioning a search term, with the numeric values found in it"""
+    context: str
+    values: tuple[str, ...]
+
+
+# Map criteria to search terms (deduplicated once here rather than per call)
+_CRITERIA_MAPPING = {key: tuple(dict.fromkeys(terms)) for key, terms in {
+    'diversity': ['population', 'demographics', 'race', 'ethnicity', 'percent', 'percentage', 'composition'],
+    'weather': ['climate', 'temperature', 'rainfall', 'precipitation', 'humidity', 'snow', 'sunny days'],
+    'crime': ['crime', 'murder', 'violent', 'property crime', 'safety', 'crime rate', 'homicide'],
+    'education': ['education', 'school', 'university', 'literacy', 'college', 'graduation rate', 'test scores'],
+    'income': ['income', 'median household', 'per capita', 'poverty', 'salary', 'wage', 'gdp', 'economic'],
+    'cost of living': ['cost', 'housing', 'rent', 'median home', 'price', 'affordable'],
+    'population': ['population', 'density', 'metropolitan', 'residents', 'inhabitants'],
+    'healthcare': ['hospital', 'health', 'life expectancy', 'mortality', 'healthcare', 'medical'],
+    'transportation': ['transit', 'commute', 'public transport', 'traffic', 'walkability', 'bike'],
+}.items()}
+
+# Used when the criteria doesn't match any mapping
+_GENERIC_TERMS = ('population', 'demographics', 'median', 'average', 'rate', 'percent')
+
+# Reverse index of every keyword (mapping key or search term) -> mapping key. Keywords keep the
+# mapping's order and the first key to claim one wins, so scanning it in order picks the same
+# criteria the mapping itself would.
+_KEYWORDS = {}
+for _key, _terms in _CRITERIA_MAPPING.items():
+    for _keyword in (_key,) + _terms:
+        _KEYWORDS.setdefault(_keyword, _key)
+
+
+@lru_cache(maxsize=64)
+def _resolve_terms(criteria: str) -> tuple:
+    """
+    Search terms for a criteria (the first matching keyword wins, generic terms otherwise).
+    
+    Args:
+        criteria: The criteria the user cares about (e.g., 'weather', 'crime rates')
+        
+    Returns:
+        Tuple of search terms
+    """
+    criteria_lower = criteria.lower()
+    key = next((key for keyword, key in _KEYWORDS.items() if keyword in criteria_lower), None)
+    return _CRITERIA_MAPPING.get(key, _GENERIC_TERMS)
+
+
+@lru_cache(maxsize=64)
+def _term_matcher(terms_lower: tuple) -> tuple:
+    """
+    Compile one pattern that finds every search term in a lowercased sentence in a single pass.
+    
+    The alternation sits in a lookahead so it is tried at every position, longest term first. Any
+    other term found at the same position is a prefix of the reported one, so each term also maps
+    to the terms it implies.
+    
+    Returns:
+        (compiled pattern, dict of term -> terms present whenever it matches)
+    """
+    alternation = '|'.join(re.escape(term) for term in sorted(terms_lower, key=len, reverse=True))
+    pattern = re.compile(f'(?=({alternation}))')
+    implied = {term: [other for other in terms_lower if term.startswith(other)] for term in terms_lower}
+    return pattern, implied
+
+
+def extract_numeric_data(text: str, search_terms: list[str], max_matches: Optional[int] = 3) -> dict:
     """
     Extract numeric data from Wikipedia text based on search terms.
     
     Args:
         text: Wikipedia article text
         search_terms: List of terms to search for (e.g., ['population', 'density', 'median income'])
+        max_matches: Stop collecting matches for a term after this many (None for full extraction)
         
     Returns:
-        Dictionary of found numeric data with context
+        Dictionary of term -> tuple of matches, each a (context, values) named tuple
     """
-    results = {}
+    # Dedup in order so repeated terms share a cache entry; the cached result is shared between
+    # calls, and its matches are immutable, so a shallow copy is enough
+    return dict(_extract_numeric_data(text, tuple(dict.fromkeys(search_terms)), max_matches))
+
+
+@lru_cache(maxsize=128)
+def _extract_numeric_data(text: str, search_terms: tuple, max_matches: Optional[int]) -> dict:
+    """Memoized extract_numeric_data; the same article and terms always give the same result"""
+    if not search_terms:
+        return {}
     
-    # Split into sentences
-    sentences = re.split(r'[.!?]', text)
+    terms_lower = tuple(dict.fromkeys(term.lower() for term in search_terms))
+    pattern, implied = _term_matcher(terms_lower)
     
-    for term in search_terms:
-        matches = []
-        for sentence in sentences:
-            # Check if the search term appears in this sentence
-            if term.lower() in sentence.lower():
-                # Look for numbers in the sentence (including percentages, currency, etc.)
-                numbers = re.findall(r'[\$]?[\d,]+\.?\d*%?', sentence)
-                if numbers:
-                    matches.append({
-                        'context': sentence.strip(),
-                        'values': numbers
-                    })
+    # Split into sentences and scan each one once for all terms. Lowercase the article once:
+    # lower() never adds or removes a '.', so the lowercased pieces line up with the originals.
+    # (Only a Greek capital sigma ending a sentence lowercases differently than it would on its
+    # own, which doesn't affect the English search terms.)
+    text = text.translate(_SENT_TBL)
+    sentences = text.split('.')
+    sentences_lower = text.lower().split('.')
+    term_matches = {}
+    # Terms that already have max_matches matches
+    full = set()
+    
+    for sentence, sentence_lower in zip(sentences, sentences_lower):
+        found = {match.group(1) for match in pattern.finditer(sentence_lower)}
+        if not found:
+            continue
+        
+        terms = set().union(*(implied[term] for term in found)) - full
+        if not terms:
+            continue
+        
+        # Look for numbers in the sentence (including percentages, currency, etc.)
+        numbers = _NUM_RE.findall(sentence)
+        if not numbers:
+            continue
+        
+        match = _Match(sentence.strip(), tuple(numbers))
+        for term_lower in terms:
+            matches = term_matches.setdefault(term_lower, [])
+            matches.append(match)
+            if max_matches is not None and len(matches) >= max_matches:
+                full.add(term_lower)
         
+        # Every term is capped, so the rest of the article can't add anything
+        if len(full) == len(terms_lower):
+            break
+    
+    # Report terms in the order they were requested
+    results = {}
+    for term in search_terms:
+        matches = term_matches.get(term.lower())
         if matches:
-            results[term] = matches
+            results[term] = tuple(matches)
+    
+    return results
+
+
+def _fetch_intros(cities: list[str]) -> dict:
+    """
+    Fetch the plain-text intros of several cities' Wikipedia articles in one MediaWiki API request.
+    
+    Args:
+        cities: Article titles to look up (redirects such as "NYC" are followed)
+        
+    Returns:
+        Dictionary of city -> intro text, or None if there is no article or only a disambiguation page
+    """
+    response = _SESSION.get(
+        _WIKI_API,
+        params={
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,
+            "prop": "extracts|pageprops",
+            "exintro": 1,
+            "explaintext": 1,
+            "exsectionformat": "plain",
+            "ppprop": "disambiguation",
+            "redirects": 1,
+            "titles": "|".join(cities),
+        },
+        timeout=10
+    )
+    response.raise_for_status()
+    query = response.json().get("query", {})
+    
+    # Follow the API's title normalization and redirects to map each page back to the city asked for
+    normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+    redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+    intros = {}
+    for page in query.get("pages", []):
+        if page.get("missing") or "disambiguation" in page.get("pageprops", {}):
+            continue
+        intros[page.get("title")] = page.get("extract") or None
+    
+    results = {}
+    for city in cities:
+        title = normalized.get(city, city)
+        results[city] = intros.get(redirects.get(title, title))
     
     return results
 
 
+def _cached_wiki(cities: tuple) -> tuple:
+    """
+    Wikipedia text for each city, reusing results cached on disk within the last 24 hours and
+    fetching the rest together in a single MediaWiki request.
+    
+    Args:
+        cities: City names, whitespace-normalized by the caller
+        
+    Returns:
+        Tuple of results in the same order as cities
+    """
+    results = {}
+    for city in dict.fromkeys(cities):
+        cached = cache_get("wikipedia", city)
+        if cached is not None:
+            print(f"   💾 Using cached Wikipedia data for {city}")
+            results[city] = cached
+    
+    missing = [city for city in dict.fromkeys(cities) if city not in results]
+    if missing:
+        results.update(_fetch_intros(missing))
+        
+        # No exact article; let WikipediaTools search for the closest one (concurrently if several)
+        not_found = [city for city in missing if results[city] is None]
+        if not_found:
+            with ThreadPoolExecutor(max_workers=len(not_found)) as executor:
+                found = executor.map(lambda city: WikipediaTools().search_wikipedia(city), not_found)
+                results.update(zip(not_found, found))
+        
+        # Only text results can be cached
+        for city in missing:
+            if isinstance(results[city], str):
+                cache_set("wikipedia", city, results[city])
+    
+    return tuple(results[city] for city in cities)
+
+
+# Response templates, formatted once per call (header) or per term/match (%-style)
+_HEADER_TMPL = """
+Wikipedia Analysis - {title}
+==========================================
+
+Current City: {current}
+Desired City: {desired}
+Criteria: {criteria}
+
+NUMERIC DATA FROM {city_upper}:
+"""
+
+_CITY_TMPL = """
+
+NUMERIC DATA FROM {city_upper}:
+"""
+
+_TERM_TMPL = "\n%s:\n"
+
+_MATCH_TMPL = "  • %s\n    Values found: %s\n"
+
+_NO_DATA = "  No numeric data found for the specified criteria.\n"
+
+_INSTRUCTIONS = """
+
+INSTRUCTIONS FOR ANALYSIS:
+Compare the numeric data between the two cities for the specified criteria.
+Highlight significant differences and explain what they mean for the user.
+If data is missing for either city, note this limitation in your analysis.
+Focus on objective comparisons based on the numeric data extracted.
+"""
+
+
 def search_wikipedia_for_criteria(current_city: str, desired_city: str, criteria: str) -> str:
     """
     Search Wikipedia for both cities and extract numeric data relevant to user criteria.
@@ -55,97 +295,52 @@ def search_wikipedia_for_criteria(current_city: str, desired_city: str, criteria
     print(f"   Criteria: {criteria}")
     print(f"   ⏳ Searching Wikipedia...\n")
     
-    # Map criteria to search terms
-    criteria_mapping = {
-        'diversity': ['population', 'demographics', 'race', 'ethnicity', 'percent', 'percentage', 'composition'],
-        'weather': ['climate', 'temperature', 'rainfall', 'precipitation', 'humidity', 'snow', 'sunny days'],
-        'crime': ['crime', 'murder', 'violent', 'property crime', 'safety', 'crime rate', 'homicide'],
-        'education': ['education', 'school', 'university', 'literacy', 'college', 'graduation rate', 'test scores'],
-        'income': ['income', 'median household', 'per capita', 'poverty', 'salary', 'wage', 'gdp', 'economic'],
-        'cost of living': ['cost', 'housing', 'rent', 'median home', 'price', 'affordable'],
-        'population': ['population', 'density', 'metropolitan', 'residents', 'inhabitants'],
-        'healthcare': ['hospital', 'health', 'life expectancy', 'mortality', 'healthcare', 'medical'],
-        'transportation': ['transit', 'commute', 'public transport', 'traffic', 'walkability', 'bike'],
-    }
-    
     # Get search terms for this criteria
-    criteria_lower = criteria.lower()
-    search_terms = []
-    
-    # Find matching criteria
-    for key, terms in criteria_mapping.items():
-        if key in criteria_lower or any(term in criteria_lower for term in terms):
-            search_terms.extend(terms)
-            break
-    
-    # If no match, use generic terms
-    if not search_terms:
-        search_terms = ['population', 'demographics', 'median', 'average', 'rate', 'percent']
-    
-    # Remove duplicates
-    search_terms = list(set(search_terms))
+    search_terms = _resolve_terms(criteria)
     
     try:
-        # Initialize Wikipedia tool
-        wiki_tool = WikipediaTools()
-        
-        # Search for current city
+        # Search for both cities in one request (cached; case is kept since it matters for Wikipedia disambiguation)
         print(f"📖 Searching Wikipedia for {current_city}...")
-        current_city_data = wiki_tool.search_wikipedia(current_city)
-        current_city_numeric = extract_numeric_data(current_city_data, search_terms)
-        
-        # Search for desired city
         print(f"📖 Searching Wikipedia for {desired_city}...")
-        desired_city_data = wiki_tool.search_wikipedia(desired_city)
+        current_city_data, desired_city_data = _cached_wiki(
+            (" ".join(current_city.split()), " ".join(desired_city.split()))
+        )
+        
+        current_city_numeric = extract_numeric_data(current_city_data, search_terms)
         desired_city_numeric = extract_numeric_data(desired_city_data, search_terms)
         
         print(f"✅ [WIKIPEDIA TOOL] Successfully retrieved Wikipedia data!\n")
         
         # Build the response
-        response = f"""
-Wikipedia Analysis - {criteria.title()}
-==========================================
-
-Current City: {current_city}
-Desired City: {desired_city}
-Criteria: {criteria}
-
-NUMERIC DATA FROM {current_city.upper()}:
-"""
+        parts = [_HEADER_TMPL.format(
+            title=criteria.title(),
+            current=current_city,
+            desired=desired_city,
+            criteria=criteria,
+            city_upper=current_city.upper()
+        )]
         
         if current_city_numeric:
             for term, matches in current_city_numeric.items():
-                response += f"\n{term.title()}:\n"
+                parts.append(_TERM_TMPL % term.title())
                 for match in matches[:3]:  # Limit to top 3 matches per term
-                    response += f"  • {match['context']}\n"
-                    response += f"    Values found: {', '.join(match['values'])}\n"
+                    parts.append(_MATCH_TMPL % (match.context, ', '.join(match.values)))
         else:
-            response += "  No numeric data found for the specified criteria.\n"
+            parts.append(_NO_DATA)
         
-        response += f"""
-
-NUMERIC DATA FROM {desired_city.upper()}:
-"""
+        parts.append(_CITY_TMPL.format(city_upper=desired_city.upper()))
         
         if desired_city_numeric:
             for term, matches in desired_city_numeric.items():
-                response += f"\n{term.title()}:\n"
+                parts.append(_TERM_TMPL % term.title())
                 for match in matches[:3]:  # Limit to top 3 matches per term
-                    response += f"  • {match['context']}\n"
-                    response += f"    Values found: {', '.join(match['values'])}\n"
+                    parts.append(_MATCH_TMPL % (match.context, ', '.join(match.values)))
         else:
-            response += "  No numeric data found for the specified criteria.\n"
+            parts.append(_NO_DATA)
         
-        response += """
-
-INSTRUCTIONS FOR ANALYSIS:
-Compare the numeric data between the two cities for the specified criteria.
-Highlight significant differences and explain what they mean for the user.
-If data is missing for either city, note this limitation in your analysis.
-Focus on objective comparisons based on the numeric data extracted.
-"""
+        parts.append(_INSTRUCTIONS)
         
-        return response
+        return "".join(parts)
         
     except Exception as e:
         print(f"⚠️ [WIKIPEDIA TOOL] Error fetching data: {e}")
@@ -6,15 +6,24 @@ Run this to test the API locally or on Railway.
 import requests
 import time
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure the base URL
 BASE_URL = "http://localhost:8000"  # Change to your Railway URL when deployed
 
+# Shared session so health checks, submission and polling reuse one keep-alive connection.
+# Retries cover connection errors on idempotent requests only (POST /analyze is never retried).
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("http://", _ADAPTER)
+SESSION.mount("https://", _ADAPTER)
+
 def test_health_check():
     """Test the health check endpoint"""
     print("Testing health check endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         response.raise_for_status()
         print("✅ Health check passed")
         print(f"   Response: {response.json()}")
@@ -38,7 +47,7 @@ def submit_analysis():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/analyze", json=payload)
+        response = SESSION.post(f"{BASE_URL}/analyze", json=payload)
         response.raise_for_status()
         data = response.json()
         
@@ -52,13 +61,15 @@ def submit_analysis():
         print(f"❌ Failed to submit analysis: {e}")
         return None
 
-def poll_analysis(analysis_id, max_attempts=60, interval=10):
-    """Poll for analysis results"""
-    print(f"\nPolling for results (checking every {interval} seconds)...")
+def poll_analysis(analysis_id, max_attempts=60, initial_delay=0.5, max_delay=10.0, backoff=1.5):
+    """Poll for analysis results, backing off exponentially from initial_delay up to max_delay seconds"""
+    print(f"\nPolling for results (every {initial_delay}s, backing off to {max_delay}s)...")
     
+    start = time.monotonic()
+    delay = initial_delay
     for attempt in range(max_attempts):
         try:
-            response = requests.get(f"{BASE_URL}/analysis/{analysis_id}")
+            response = SESSION.get(f"{BASE_URL}/analysis/{analysis_id}")
             response.raise_for_status()
             data = response.json()
             
@@ -93,14 +104,14 @@ def poll_analysis(analysis_id, max_attempts=60, interval=10):
                 print(f"\n❌ Analysis failed: {data.get('error', 'Unknown error')}")
                 return False
             
-            # Still processing, wait before next poll
-            time.sleep(interval)
-            
         except Exception as e:
             print(f"   ❌ Error checking status: {e}")
-            time.sleep(interval)
+        
+        # Still processing (or a transient error), wait before next poll
+        time.sleep(delay)
+        delay = min(delay * backoff, max_delay)
     
-    print(f"\n⏱️  Timeout: Analysis did not complete within {max_attempts * interval} seconds")
+    print(f"\n⏱️  Timeout: Analysis did not complete within {time.monotonic() - start:.0f} seconds")
     return False
 
 def main():